@@ -27,29 +27,30 @@ function generateDemo() {
 
     // 读取文件
     const jsonData = JSON.parse(fs.readFileSync(jsonPath, 'utf8'));
-    let templateContent = fs.readFileSync(templatePath, 'utf8');
+    const template = fs.readFileSync(templatePath, 'utf8');
 
     // 检查必要的字段
     if (!jsonData.final_result) {
       throw new Error('visualization_result.json 中缺少 final_result 字段');
     }
 
-    // 解析 visualization_result 字段
-    const result = JSON.parse(jsonData.final_result);
+    // 解析 final_result 字段（新版本直接保存为 JSON 结构，旧版本为 JSON 字符串）
+    const result =
+      typeof jsonData.final_result === 'string' ? JSON.parse(jsonData.final_result) : jsonData.final_result;
 
     // 替换变量
     const replacements = {
-      '{{title}}': '数据可视化分析报告',
-      '{{description}}': result.description || '基于AI智能分析的数据可视化展示',
-      '{{timestamp}}': jsonData.timestamp || new Date().toISOString(),
-      '{{charts_json}}': JSON.stringify(result),
+      title: '数据可视化分析报告',
+      description: result.description || '基于AI智能分析的数据可视化展示',
+      timestamp: jsonData.timestamp || new Date().toISOString(),
+      // 内嵌于 <script type="application/json">，转义 < 防止数据中的 </script> 提前闭合标签
+      charts_json: JSON.stringify(result).replace(/</g, '\\u003c'),
     };
 
-    // 执行替换
-    for (const [placeholder, value] of Object.entries(replacements)) {
-      const regex = new RegExp(placeholder.replace(/[{}]/g, '\\$&'), 'g');
-      templateContent = templateContent.replace(regex, value);
-    }
+    // 单次扫描模板完成全部替换；使用回调函数，避免替换值中的 $& 等特殊序列被展开
+    const templateContent = template.replace(/\{\{(\w+)\}\}/g, (match, name) =>
+      Object.prototype.hasOwnProperty.call(replacements, name) ? replacements[name] : match
+    );
 
     // 写入文件
     fs.writeFileSync(outputPath, templateContent, 'utf8');
@@ -4,12 +4,28 @@
 """
 
 import os
-import json
 import re
+import hashlib
+import mmap
+import shutil
+from functools import lru_cache
 from typing import Dict, Any
-from crewai import Agent, Task, Crew, Process
+import orjson
 from dotenv import load_dotenv
 from datetime import datetime
+import prompts
+from prompts import (
+    INFORMATION_PROCESSOR_ROLE,
+    INFORMATION_PROCESSOR_GOAL,
+    INFORMATION_PROCESSOR_BACKSTORY,
+    VISUALIZER_ROLE,
+    VISUALIZER_GOAL,
+    VISUALIZER_BACKSTORY,
+    INFORMATION_PROCESSING_DESCRIPTION,
+    INFORMATION_PROCESSING_EXPECTED_OUTPUT,
+    VISUALIZATION_DESCRIPTION,
+    VISUALIZATION_EXPECTED_OUTPUT,
+)
 
 
 # 加载环境变量
@@ -38,6 +54,48 @@ def get_qwen_llm() -> str:
 llm = get_deepseek_llm()
 # llm = get_qwen_llm()
 
+# 各 provider 对应的 API Key 环境变量（litellm 约定）
+API_KEY_ENV_VARS = {
+    "deepseek": "DEEPSEEK_API_KEY",
+    "dashscope": "DASHSCOPE_API_KEY",
+}
+
+
+# JSON 提取用的正则，模块加载时编译一次
+JSON_CODE_BLOCK_RE = re.compile(r"```json\s*\n(.*?)\n```", re.DOTALL)
+
+
+def find_json_object(text: str) -> str:
+    """线性扫描查找第一个括号配平的 JSON 对象（忽略字符串中的括号），避免贪婪正则回溯"""
+    start = text.find("{")
+    if start == -1:
+        return ""
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start : i + 1]
+
+    # 括号未配平时，退回到第一个 { 到最后一个 } 之间的内容
+    end = text.rfind("}")
+    return text[start : end + 1] if end > start else ""
+
 
 def extract_json_from_markdown(text: str) -> str:
     """从包含 markdown 代码块的文本中提取 JSON 内容"""
@@ -45,123 +103,64 @@ def extract_json_from_markdown(text: str) -> str:
         return ""
 
     # 查找 ```json ... ``` 格式的内容
-    json_pattern = r"```json\s*\n(.*?)\n```"
-    match = re.search(json_pattern, text, re.DOTALL)
+    match = JSON_CODE_BLOCK_RE.search(text)
 
     if match:
         return match.group(1).strip()
 
     # 如果没有找到 ```json 格式，尝试查找纯 JSON 内容
-    # 查找第一个 { 到最后一个 } 之间的内容
-    json_pattern = r"\{.*\}"
-    match = re.search(json_pattern, text, re.DOTALL)
+    # 查找从第一个 { 开始、括号配平的 JSON 对象
+    json_text = find_json_object(text)
 
-    if match:
-        return match.group(0).strip()
+    if json_text:
+        return json_text.strip()
 
     # 如果都没找到，返回原文本
     return text
 
 
-# 创建 Agent
-information_processor = Agent(
-    role="信息处理专家",
-    goal="通读文章，识别并提取核心论点、关键数据和重要实体，然后进行归纳、分类，并转换为适合可视化的结构化数据",
-    backstory="你是一位专业的信息处理专家，既擅长从复杂文本中提取关键信息，又精通将非结构化信息转换为结构化数据。你能够：\n"
-    "1. 深度分析文本内容，识别核心论点、关键数据和重要实体\n"
-    "2. 对提取的信息进行归纳、分类和结构化处理\n"
-    "3. 将处理后的信息转换为适合可视化的JSON格式数据\n"
-    "4. 确保数据的完整性和逻辑性，为后续可视化提供高质量的结构化数据\n"
-    "**重要约束：绝对禁止生成任何虚拟、推测或虚构的数据，所有数据必须严格来源于原始文本**",
-    llm=llm,
-    verbose=True,
-)
+@lru_cache(maxsize=1)
+def create_agents():
+    """创建信息处理专家与可视化工程师两个 Agent（进程内只构建一次）"""
+    # crewai 导入较重，延迟到真正需要时再导入，使读取输入失败等情况能快速退出
+    from crewai import Agent
 
-visualizer = Agent(
-    role="可视化工程师",
-    goal="根据数据结构智能选择最合适的可视化类型，生成 Card 卡片展示和 ECharts 图表配置，确保数据故事完整性和可视化效果最佳",
-    backstory="你是一位资深的数据可视化专家，精通各种图表类型和可视化最佳实践。你能够：\n"
-    "1. 分析数据特征，识别关键洞察点\n"
-    "2. 智能选择最适合的可视化类型：Card 卡片展示（适合摘要信息）或 ECharts 图表（适合数据可视化）\n"
-    "3. 生成 Card 卡片：包含标题、摘要、关键数据点，适合快速信息概览\n"
-    "4. 生成 ECharts 配置：柱状图、折线图、饼图、雷达图等，适合详细数据分析\n"
-    "5. 确保不同可视化类型间的逻辑关联性和视觉一致性\n"
-    "6. 考虑用户交互体验和内容可读性\n"
-    "**严格约束：绝对禁止生成任何虚拟、推测或虚构的数据，所有图表数据必须严格来源于输入的结构化数据，不得添加任何原始数据中不存在的数值、比例或权重**",
-    llm=llm,
-    verbose=True,
-)
+    information_processor = Agent(
+        role=INFORMATION_PROCESSOR_ROLE,
+        goal=INFORMATION_PROCESSOR_GOAL,
+        backstory=INFORMATION_PROCESSOR_BACKSTORY,
+        llm=llm,
+        verbose=True,
+    )
+
+    visualizer = Agent(
+        role=VISUALIZER_ROLE,
+        goal=VISUALIZER_GOAL,
+        backstory=VISUALIZER_BACKSTORY,
+        llm=llm,
+        verbose=True,
+    )
+
+    return information_processor, visualizer
 
 
 def process_text_with_crewai(text: str) -> Dict[str, Any]:
     """使用 CrewAI 处理文本信息可视化"""
+    from crewai import Task, Crew, Process
+
+    information_processor, visualizer = create_agents()
 
     information_processing_task = Task(
-        description=f"请分析以下文本内容，完成信息提取和结构化处理：\n\n{text}\n\n"
-        "请按以下步骤执行：\n"
-        "1. 深度分析文本内容，识别核心论点、关键数据和重要实体\n"
-        "2. 对提取的信息进行归纳、分类和结构化处理\n"
-        "3. 将处理后的信息转换为适合可视化的JSON格式数据\n"
-        "4. 确保数据的完整性和逻辑性\n"
-        "**严格约束：绝对禁止生成任何虚拟、推测或虚构的数据，所有数据必须严格来源于原始文本，不得添加任何原始文本中不存在的数值、比例或权重**",
+        description=f"{INFORMATION_PROCESSING_DESCRIPTION}\n\n"
+        f"待分析的文本内容如下：\n\n{text}",
         agent=information_processor,
-        expected_output="结构化的 JSON 数据，包含实体、指标、分类等信息，以及信息提取的详细报告。所有数据必须严格来源于原始文本。",
+        expected_output=INFORMATION_PROCESSING_EXPECTED_OUTPUT,
     )
 
     visualization_task = Task(
-        description="基于信息处理专家提供的结构化数据，进行深度分析并生成多种类型的可视化展示。\n"
-        "请按以下步骤执行：\n"
-        "1. 分析数据结构，识别关键数据维度和关系\n"
-        "2. 智能选择可视化类型：\n"
-        "   - Card 卡片：适合展示摘要信息、关键数据点、核心论点\n"
-        "   - ECharts 图表：适合展示详细数据分析和趋势\n"
-        "3. 为 Card 卡片生成：标题、摘要、关键数据点、核心洞察\n"
-        "4. 为 ECharts 图表选择最适合的类型（柱状图、折线图、饼图、散点图等）\n"
-        "5. 确保不同可视化类型间有逻辑关联，形成完整的数据分析报告\n"
-        "6. **重要：严格避免内容重复，确保每个可视化项都有独特的价值：\n"
-        "   - 卡片之间：避免相同数据点的重复展示，每个卡片应聚焦不同维度\n"
-        "   - 图表之间：避免相同数据的不同展示形式，每个图表应展示不同的分析角度\n"
-        "   - 卡片与图表：避免数据重复，卡片展示摘要，图表展示详细分析\n"
-        "   - 内容差异化：每个可视化项应提供独特的信息价值，避免冗余\n"
-        "7. 内容分配策略：\n"
-        "   - 第一个卡片：核心摘要和总体趋势\n"
-        "   - 第二个卡片：关键指标和重要发现（与第一个卡片不重复）\n"
-        "   - 第一个图表：时间序列分析或趋势对比\n"
-        "   - 第二个图表：分类分析或结构分析（与第一个图表不重复）\n"
-        "   - 第三个图表：影响因素分析或相关性分析（与前两个图表不重复）\n"
-        "8. **严格约束：绝对禁止生成任何虚拟、推测或虚构的数据：\n"
-        "   - 所有图表数据必须严格来源于输入的结构化数据\n"
-        "   - 不得添加任何原始数据中不存在的数值、比例或权重\n"
-        "   - 如果原始数据中没有量化权重，不得生成雷达图等需要数值权重的图表\n"
-        "   - 如果原始数据中没有百分比数据，不得生成饼图等需要比例数据的图表\n"
-        "   - 优先选择能够直接使用原始数据的图表类型（如折线图、柱状图）\n",
+        description=VISUALIZATION_DESCRIPTION,
         agent=visualizer,
-        expected_output="包含可视化项的JSON对象：\n"
-        "visualizations: 可视化项数组，每个项包含：\n"
-        "1. Card 卡片配置：\n"
-        "   - type: 'card'\n"
-        "   - card_id: 卡片唯一标识\n"
-        "   - title: 卡片标题（确保与其他卡片标题不重复）\n"
-        "   - summary: 摘要内容（确保与其他卡片内容不重复）\n"
-        "   - key_points: 关键数据点列表（确保数据点不重复）\n"
-        "   - insights: 核心洞察（确保洞察角度不重复）\n"
-        "2. ECharts 图表配置：\n"
-        "   - type: 'echarts'\n"
-        "   - chart_id: 图表唯一标识\n"
-        "   - title: 图表标题（确保与其他图表标题不重复）\n"
-        "   - config: 完整的ECharts配置，不需要包含color相关配置，不允许出现javascript函数\n"
-        "**严格数据约束：\n"
-        "- 所有图表数据必须严格来源于输入的结构化数据\n"
-        "- 绝对禁止生成任何虚拟、推测或虚构的数据\n"
-        "- 不得添加任何原始数据中不存在的数值、比例或权重\n"
-        "- 如果原始数据中没有量化权重，不得生成雷达图等需要数值权重的图表\n"
-        "- 如果原始数据中没有百分比数据，不得生成饼图等需要比例数据的图表\n"
-        "- 优先选择能够直接使用原始数据的图表类型（如折线图、柱状图）\n"
-        "**去重要求：\n"
-        "- 每个可视化项必须有独特的信息价值\n"
-        "- 避免相同数据在不同可视化项中重复展示\n"
-        "- 确保卡片和图表之间的内容互补而非重复\n"
-        "- 每个可视化项应聚焦不同的分析维度或数据角度\n",
+        expected_output=VISUALIZATION_EXPECTED_OUTPUT,
         context=[information_processing_task],
     )
 
@@ -189,40 +188,133 @@ def process_text_with_crewai(text: str) -> Dict[str, Any]:
     }
 
 
+# 结果缓存目录：以输入内容的哈希命名缓存文件，输入未变化时跳过 CrewAI 处理
+CACHE_DIR = ".cache"
+
+# 设置该环境变量为 1 时不读取缓存，强制重新调用 LLM（有效的新结果仍会写入缓存）
+NO_CACHE_ENV = "INFOVIZ_NO_CACHE"
+
+# 参与缓存键计算的提示词：取 prompts 模块中全部大写命名的字符串常量（按名称排序），
+# 新增或修改任一提示词、更换模型都会使旧缓存失效
+CACHE_KEY_PROMPTS = tuple(
+    value
+    for name, value in sorted(vars(prompts).items())
+    if name.isupper() and isinstance(value, str)
+)
+
+
+def get_cache_path(text: str) -> str:
+    """根据模型、提示词与输入内容的 SHA-256 计算对应的缓存结果文件路径"""
+    hasher = hashlib.sha256()
+    for part in (llm, *CACHE_KEY_PROMPTS, text):
+        hasher.update(part.encode("utf-8"))
+        hasher.update(b"\0")
+    digest = hasher.hexdigest()
+    return os.path.join(CACHE_DIR, f"visualization_result_{digest}.json")
+
+
+def is_cacheable_result(final_result: Any) -> bool:
+    """仅当 final_result 解析为包含 visualizations 列表的 JSON 对象时才允许写入缓存"""
+    return isinstance(final_result, dict) and isinstance(
+        final_result.get("visualizations"), list
+    )
+
+
+def parse_json_or_text(text: str) -> Any:
+    """能解析为 JSON 的结果直接以 JSON 结构返回，否则保留原始文本
+
+    注意：数值转换并非无损。超出 64 位范围的整数会被静默转为 float
+    （如 123456789012345678901234567890 -> 1.2345678901234568e+29），
+    浮点数重新序列化后的写法也可能变化（如 1e-05）。
+    """
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return text
+
+
+# 超过该大小的输入文件改用内存映射读取
+MMAP_READ_THRESHOLD = 1 << 20
+
+
+def read_text_file(path: str) -> str:
+    """读取 UTF-8 文本文件，大文件直接从内存映射解码，避免先整体读入 bytes 再解码"""
+    if os.path.getsize(path) <= MMAP_READ_THRESHOLD:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = str(mm, "utf-8")
+    # 与文本模式读取保持一致，统一换行符
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
 def main():
     """主程序入口"""
     print("🚀 启动基于 CrewAI 的信息可视化应用")
 
     try:
-        with open("data.txt", "r", encoding="utf-8") as f:
-            text_content = f.read()
+        text_content = read_text_file("data.txt")
         print(f"📄 已读取数据文件，内容长度: {len(text_content)} 字符")
     except FileNotFoundError:
         print("❌ 未找到 data.txt 文件")
         return
 
+    # 空输入无可提取的内容，直接返回，避免空跑整个 CrewAI 流程
+    if not text_content.strip():
+        print("⚠️  data.txt 内容为空，跳过处理")
+        return
+
+    cache_path = get_cache_path(text_content)
+    use_cache = os.getenv(NO_CACHE_ENV, "").strip().lower() not in ("1", "true", "yes")
+    if not use_cache:
+        print(f"🔁 已设置 {NO_CACHE_ENV}，跳过缓存，重新调用 LLM")
+    elif os.path.exists(cache_path):
+        shutil.copyfile(cache_path, "visualization_result.json")
+        print(f"♻️  输入内容与提示词均未变化，已复用缓存结果: {cache_path}")
+        return
+
+    # 在导入 crewai、构建 Agent 之前检查 API Key，配置缺失时快速失败
+    api_key_env = API_KEY_ENV_VARS.get(llm.split("/", 1)[0])
+    if api_key_env and not os.getenv(api_key_env):
+        print(f"❌ 未设置 {api_key_env} 环境变量，请在 .env 文件中配置")
+        return
+
     print("\n🔄 开始 CrewAI 二阶段处理...")
 
     try:
         results = process_text_with_crewai(text_content)
         print("\n✅ 处理完成！")
 
-        # 保存结果
+        # 保存结果：JSON 结果直接作为嵌套结构写入，避免以转义字符串形式二次序列化
         serializable_results = {
-            "information_processing_result": str(
-                results.get("information_processing_result", "")
-            ),
-            "visualization_result": str(results.get("visualization_result", "")),
-            "final_result": str(results.get("final_result", "")),
+            "information_processing_result": results["information_processing_result"],
+            "visualization_result": parse_json_or_text(results["visualization_result"]),
+            "final_result": parse_json_or_text(results["final_result"]),
             "timestamp": str(datetime.now()),
         }
 
-        with open("visualization_result.json", "w", encoding="utf-8") as f:
-            json.dump(serializable_results, f, ensure_ascii=False, indent=2)
-        print(f"💾 结果已保存到: visualization_result.json")
+        # orjson 直接输出 UTF-8 字节（2 空格缩进、不转义非 ASCII 字符）；
+        # 嵌套结果经重新序列化，与模型原文并非逐字节一致，数值转换的限制见 parse_json_or_text
+        with open("visualization_result.json", "wb") as f:
+            f.write(orjson.dumps(serializable_results, option=orjson.OPT_INDENT_2))
+        print("💾 结果已保存到: visualization_result.json")
+
+        # 仅缓存有效的可视化结果：模型未返回可解析的 JSON 时不写入，避免后续运行反复复用错误结果
+        if not is_cacheable_result(serializable_results["final_result"]):
+            print("⚠️  final_result 不是有效的可视化 JSON，本次结果不写入缓存")
+        else:
+            # 先写临时文件再原子替换，避免中断时留下不完整的缓存文件被下次复用
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp_path = f"{cache_path}.tmp"
+            shutil.copyfile("visualization_result.json", tmp_path)
+            os.replace(tmp_path, cache_path)
 
     except Exception as e:
-        print(f"❌ 处理过程中出现错误: {str(e)}")
+        print(f"❌ 处理过程中出现错误: {e}")
         import traceback
 
         traceback.print_exc()